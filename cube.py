@@ -0,0 +1,21 @@
+from datetime import datetime
+import lib
+import sys
+
+# Cube-and-conquer version of twiddler.py, see lib/cube.py.
+#   The worker processes import this file again on some platforms, so everything
+#   has to stay under the __main__ guard.
+if __name__ == "__main__":
+    setupTime = datetime.now()
+    p = lib.Parameters.setup()
+    n, winner, results = lib.cube_and_conquer(p)
+    print(f"Total Time: {datetime.now() - setupTime}")
+    print("---------------------------------------")
+
+    f = open("config.txt", "a")
+    sys.stdout = f
+    lib.print_details(winner.chords, n)
+    sys.stdout = sys.__stdout__
+    f.close()
+
+    lib.print_details(winner.chords, n)
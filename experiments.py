@@ -0,0 +1,25 @@
+from datetime import datetime
+import lib
+
+# Batch "what-if" runs, see lib/experiments.py.
+#   Edit SCENARIOS and run this instead of editing constraints into twiddler.py.
+#   Buttons are given by their bit in the Twiddler BitVector Index.
+SCENARIOS = [
+    lib.Scenario("base"),
+    # If E cannot use *M** can it achieve 2.6846?
+    lib.Scenario("E not *M**", [lib.forbid_button('E', 7)]),
+    lib.Scenario("E on *M**", [lib.force_chord('E', 0b000010000000)]),
+    # More letters that frequently end words kept off the index finger.
+    lib.Scenario("N T not index", [lib.forbid_finger('N', "index"),
+                                   lib.forbid_finger('T', "index")]),
+    lib.Scenario("T on index", [lib.force_finger('T', "index")]),
+]
+
+# The worker processes import this file again on some platforms, so everything
+#   has to stay under the __main__ guard.
+if __name__ == "__main__":
+    setupTime = datetime.now()
+    p = lib.Parameters.setup()
+    lib.run_experiments(p, SCENARIOS)
+    print(f"Total Time: {datetime.now() - setupTime}")
+    print("---------------------------------------")
@@ -8,3 +8,20 @@ from .buttons import cost_mcc
 from .buttons import cost_scc
 from .max_multi_char_chords import mcc_from_scc
 from .ghost import ghost_combos
+from .problem import Problem
+from .search import SearchResult
+from .search import search_cps
+from .display import print_config
+from .display import print_details
+from .display import model_chords
+from .cube import cube_and_conquer
+from .tactics import TACTIC_CHAINS
+from .tactics import Pipeline
+from .experiments import Scenario
+from .experiments import force_chord
+from .experiments import forbid_chord
+from .experiments import force_button
+from .experiments import forbid_button
+from .experiments import force_finger
+from .experiments import forbid_finger
+from .experiments import run_experiments
@@ -0,0 +1,148 @@
+from z3 import *
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import product
+import multiprocessing
+import lib
+
+# ***************************************
+# Cube-and-conquer
+# ***************************************
+# Automates the "Calculation method" in twiddler.py. Instead of forbidding the
+#   chord of the most frequent letter by hand and running again, the problem is
+#   split on where the cube_letters most frequent letters go. Every split (cube)
+#   is an independent problem, so the cubes are solved across a process pool.
+# A cube is a tuple with one chord per letter, None meaning "any chord not
+#   listed". Together the cubes cover every possible assignment, so the highest
+#   unsat bound of all cubes is also an upper bound on the whole problem.
+
+@dataclass
+class CubeResult:
+    cube: tuple
+    hi_sat: float = 0
+    lo_unsat: float = float("inf")
+    lo_unknown: float = float("inf")
+    # Pruned cubes were proven unable to beat the global hi_sat at the time.
+    pruned: bool = False
+    time: timedelta = timedelta()
+    chords: list = field(default_factory=lambda: [])
+
+# Every chord with at most max_buttons buttons that problem_def allows,
+#   i.e. no finger presses both its L and R buttons.
+def legal_chords(max_buttons):
+    chords = []
+    for g in range(1, 1 << 12):
+        if bin(g).count("1") > max_buttons:
+            continue
+        if any((g >> (3 * finger)) & 0b101 == 0b101 for finger in range(4)):
+            continue
+        chords.append(g)
+    return chords
+
+def top_letters(n, k):
+    letters = sorted(range(n.alphabet_size), key=lambda i: n.count[i], reverse=True)
+    return [ n.grams[i] for i in letters[:k] ]
+
+def make_cubes(letters, chords):
+    # Two letters can never share a chord, so those cubes are dropped up front.
+    cubes = []
+    for cube in product(chords + [None], repeat=len(letters)):
+        listed = [ c for c in cube if c is not None ]
+        if len(listed) == len(set(listed)):
+            cubes.append(cube)
+    return cubes
+
+def cube_constraints(n, b, letters, chords, cube):
+    constraints = []
+    for letter, chord in zip(letters, cube):
+        g = b.G[n.index[letter]]
+        if chord is None:
+            constraints.append(And([ g != c for c in chords ]))
+        else:
+            constraints.append(g == chord)
+    return constraints
+
+def describe_cube(letters, cube):
+    return " ".join(f"{letter}={'other' if chord is None else format(chord, '012b')}"
+                    for letter, chord in zip(letters, cube))
+
+# Each worker process builds the problem once and reuses the solver for all of its cubes.
+_worker = {}
+
+def _init_worker(p, letters, chords, best):
+    _worker["p"] = p
+    _worker["problem"] = lib.Problem.build(p)
+    _worker["letters"] = letters
+    _worker["chords"] = chords
+    _worker["best"] = best
+
+def _publish(best, cps):
+    with best.get_lock():
+        if cps > best.value:
+            best.value = cps
+
+def _solve_cube(cube):
+    p = _worker["p"]
+    problem = _worker["problem"]
+    best = _worker["best"]
+    s = problem.s
+    start = datetime.now()
+    r = CubeResult(cube)
+
+    s.push()
+    s.add(cube_constraints(problem.n, problem.b, _worker["letters"], _worker["chords"], cube))
+
+    # Before searching, check if this cube can beat the best CPS found so far at all.
+    floor = best.value
+    if floor > 0:
+        s.push()
+        s.add(problem.probe(floor + p.cps_res))
+        result = s.check()
+        s.pop()
+        if result == unsat:
+            s.pop()
+            r.lo_unsat = floor + p.cps_res
+            r.pruned = True
+            r.time = datetime.now() - start
+            return r
+
+    def on_probe(guess_cps, result, guess_time):
+        if result == sat:
+            _publish(best, guess_cps)
+
+    search = lib.search_cps(p, problem, floor=lambda: best.value, on_probe=on_probe)
+    s.pop()
+    r.hi_sat = search.hi_sat
+    r.lo_unsat = search.lo_unsat
+    r.lo_unknown = search.lo_unknown
+    if search.m is not None:
+        r.chords = lib.model_chords(search.m, problem.n, problem.b)
+    r.time = datetime.now() - start
+    return r
+
+def cube_and_conquer(p):
+    n = lib.NGrams.load_n_grams(p)
+    letters = top_letters(n, p.cube_letters)
+    chords = legal_chords(p.cube_buttons)
+    cubes = make_cubes(letters, chords)
+    print(f"Cube letters: {' '.join(letters)}, Chords per letter: {len(chords) + 1}, Cubes: {len(cubes)}")
+    print("---------------------------------------")
+
+    best = multiprocessing.Value("d", 0.0)
+    results = []
+    with multiprocessing.Pool(p.cube_workers or None, initializer=_init_worker,
+                              initargs=(p, letters, chords, best)) as pool:
+        for r in pool.imap_unordered(_solve_cube, cubes):
+            results.append(r)
+            status = "pruned" if r.pruned else f"{r.hi_sat:.9f}"
+            print(f"{len(results):6}/{len(cubes)} - {describe_cube(letters, r.cube)} - {status} - {r.time}")
+
+    # The optimum lies in one of the cubes, so it can be no higher than the highest cube bound.
+    winner = max(results, key=lambda r: r.hi_sat)
+    unsat_bound = max(min(r.lo_unsat, p.cps_hi) for r in results)
+    num_unknown = sum(1 for r in results if r.lo_unknown < r.lo_unsat)
+    num_pruned = sum(1 for r in results if r.pruned)
+    print("---------------------------------------")
+    print(f"Sat: {winner.hi_sat:.4f}, Unsat: {unsat_bound:.4f}, Cubes Unknown: {num_unknown}, Cubes Pruned: {num_pruned}")
+    print(f"Best cube: {describe_cube(letters, winner.cube)}")
+    return n, winner, results
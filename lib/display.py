@@ -0,0 +1,73 @@
+# ******************************************************
+# Print out quick view of what configuration looks like.
+# ******************************************************
+
+def print_config(d):
+    # The default buttons and double row buttons
+    f = [
+        2048, 3072, 1024, 1536, 512,
+        2304, 3456, 1152, 1728, 576,
+        256, 384, 128, 192, 64,
+        288, 432, 144, 216, 72,
+        32, 48, 16, 24, 8,
+        36, 54, 18, 27, 9,
+        4, 6, 2, 3, 1,
+    ]
+
+    # Mask f here when adding combo display feature.
+
+    # If a chord doesn't have an n_gram fill it with the empty string.
+    for x in f:
+        if x not in d:
+            d[x] = ""
+    # print(f[0].sort())
+    print(f'\n   Left       Middle       Right')
+    print(f' ________________________________')
+    print(f'|              Space      BckSpc | <-- Mouseclick buttons')
+    print(f'|--------------------------------|')
+    print(f'| [{d[f[0]]:4}] {d[f[1]]:4} [{d[f[2]]:4}] {d[f[3]]:4} [{d[f[4]]:4}] |')
+    print(f'|                                |')
+    print(f'|  {d[f[5]]:4}  {d[f[6]]:4}  {d[f[7]]:4}  {d[f[8]]:4}  {d[f[9]]:4}  |')
+    print(f'|                                |')
+    print(f'| [{d[f[10]]:4}] {d[f[11]]:4} [{d[f[12]]:4}] {d[f[13]]:4} [{d[f[14]]:4}] |')
+    print(f'|                                |')
+    print(f'|  {d[f[15]]:4}  {d[f[16]]:4}  {d[f[17]]:4}  {d[f[18]]:4}  {d[f[19]]:4}  |')
+    print(f'|                                |')
+    print(f'| [{d[f[20]]:4}] {d[f[21]]:4} [{d[f[22]]:4}] {d[f[23]]:4} [{d[f[24]]:4}] |')
+    print(f'|                                |')
+    print(f'|  {d[f[25]]:4}  {d[f[26]]:4}  {d[f[27]]:4}  {d[f[28]]:4}  {d[f[29]]:4}  |')
+    print(f'|                                |')
+    print(f'| [{d[f[30]]:4}] {d[f[31]]:4} [{d[f[32]]:4}] {d[f[33]]:4} [{d[f[34]]:4}] |')
+    print(f'|________________________________|')
+
+# The chord of every n_gram as plain ints. Unlike a z3 model these can be
+#   sent back from a worker process.
+def model_chords(m, n, b):
+    return [ m.eval(b.G[i], model_completion=True).as_long() for i in range(len(n.grams)) ]
+
+def print_details(chords, n):
+    # We generate a dictionary where the chords are the keys and n_grams the values.
+    num_2 = 0
+    num_3 = 0
+    num_4 = 0
+    num_5 = 0
+    press_lookup = {}
+    for i in range(len(n.grams)):
+        if chords[i] in press_lookup:
+            assert chords[i] == 0
+        else:
+            press_lookup[chords[i]] = n.grams[i]
+            if len(n.grams[i]) == 2:
+                # print("i: " + str(i) + ", chords[i]: " + str(chords[i]) + ", n.grams: " + n.grams[i])
+                num_2 += 1
+            elif len(n.grams[i]) == 3:
+                num_3 += 1
+            elif len(n.grams[i]) == 4:
+                num_4 += 1
+            elif len(n.grams[i]) == 5:
+                num_5 += 1
+            # elif len(n.grams[i]) == 1:
+            print("i: " + str(i) + ", m[G[i]]: " + str(chords[i]) + ", n_gram: " + n.grams[i])
+    print(f'Chorded-2_grams: {num_2}, 3_grams: {num_3}, 4_grams: {num_4}, 5_grams: {num_5}')
+
+    print_config(press_lookup)
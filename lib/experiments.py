@@ -0,0 +1,149 @@
+from z3 import *
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import multiprocessing
+import lib
+
+# ***************************************
+# What-if experiments
+# ***************************************
+# Replaces hand editing constraints such as
+#   s.add(Extract(7, 7, b.G[n.index['E']]) == 0)
+#   into twiddler.py and running again. Each scenario is a list of rules forcing or
+#   forbidding a chord, button or finger for a letter, and the best CPS of every
+#   scenario is searched on top of the same base problem.
+# With experiment_workers == 1 all scenarios share one solver. Each scenario is
+#   guarded by its own Bool that is passed to check() as an assumption, so what
+#   the solver learns about the base problem carries over between scenarios.
+#   Otherwise the scenarios are fanned out to a pool of worker processes, and
+#   only then is tactic_chain applied, once per scenario.
+
+# Twiddler BitVector Index
+#   L   M   R
+#   11  10  9 - Index
+#   8   7   6 - Middle
+#   5   4   3 - Ring
+#   2   1   0 - Pinky
+FINGERS = {"index": 11, "middle": 8, "ring": 5, "pinky": 2}
+
+@dataclass
+class Rule:
+    # "chord": value is the whole 12 bit chord.
+    # "button": value is the bit index of a single button.
+    # "finger": value is a key of FINGERS.
+    kind: str
+    letter: str
+    value: object
+    forced: bool
+
+def force_chord(letter, chord):
+    return Rule("chord", letter, chord, True)
+
+def forbid_chord(letter, chord):
+    return Rule("chord", letter, chord, False)
+
+def force_button(letter, bit):
+    return Rule("button", letter, bit, True)
+
+def forbid_button(letter, bit):
+    return Rule("button", letter, bit, False)
+
+def force_finger(letter, finger):
+    return Rule("finger", letter, finger, True)
+
+def forbid_finger(letter, finger):
+    return Rule("finger", letter, finger, False)
+
+@dataclass
+class Scenario:
+    name: str
+    rules: list = field(default_factory=lambda: [])
+
+@dataclass
+class ExperimentResult:
+    name: str
+    hi_sat: float = 0
+    lo_unsat: float = float("inf")
+    lo_unknown: float = float("inf")
+    time: timedelta = timedelta()
+
+def rule_constraint(n, b, rule):
+    i = n.index[rule.letter]
+    if rule.kind == "chord":
+        c = b.G[i] == rule.value
+    elif rule.kind == "button":
+        c = Extract(rule.value, rule.value, b.G[i]) == 1
+    elif rule.kind == "finger":
+        bit = FINGERS[rule.value]
+        c = Extract(bit, bit, b.F[i]) == 1
+    else:
+        assert(2 + 2 == 5) # Unknown rule kind.
+    return c if rule.forced else Not(c)
+
+def scenario_constraints(n, b, scenario):
+    return [ rule_constraint(n, b, rule) for rule in scenario.rules ]
+
+def print_results(results):
+    print("---------------------------------------")
+    print(f"Scenario                 - Sat      - Unknown  - Unsat    - Time")
+    for r in results:
+        print(f"{r.name:24} - {r.hi_sat:.6f} - {r.lo_unknown:.6f} - {r.lo_unsat:.6f} - {r.time}")
+
+def _result(name, search, start):
+    return ExperimentResult(name, search.hi_sat, search.lo_unsat, search.lo_unknown,
+                            datetime.now() - start)
+
+def _run_assumptions(p, scenarios):
+    problem = lib.Problem.build(p)
+    guards = []
+    for k in range(len(scenarios)):
+        guard = Bool(f"scenario{k}")
+        problem.s.add(Implies(guard, And(scenario_constraints(problem.n, problem.b, scenarios[k]))))
+        guards.append(guard)
+
+    results = []
+    for scenario, guard in zip(scenarios, guards):
+        start = datetime.now()
+        search = lib.search_cps(p, problem, assumptions=[guard])
+        results.append(_result(scenario.name, search, start))
+        print(f"{scenario.name:24} - {search.hi_sat:.9f} - {datetime.now() - start}")
+    return results
+
+# Each worker process builds the base problem once and reuses it for all of its scenarios.
+_worker = {}
+
+def _init_worker(p):
+    _worker["p"] = p
+    _worker["problem"] = lib.Problem.build(p)
+
+def _solve_scenario(scenario):
+    p = _worker["p"]
+    problem = _worker["problem"]
+    start = datetime.now()
+    problem.s.push()
+    problem.s.add(scenario_constraints(problem.n, problem.b, scenario))
+    search = problem
+    if p.tactic_chain != "none":
+        search = lib.Pipeline.build(p, problem, p.tactic_chain)
+    r = lib.search_cps(p, search)
+    problem.s.pop()
+    return _result(scenario.name, r, start)
+
+def _run_pool(p, scenarios):
+    results = []
+    with multiprocessing.Pool(p.experiment_workers or None, initializer=_init_worker,
+                              initargs=(p,)) as pool:
+        for r in pool.imap(_solve_scenario, scenarios):
+            results.append(r)
+            print(f"{r.name:24} - {r.hi_sat:.9f} - {r.time}")
+    return results
+
+def run_experiments(p, scenarios):
+    print(f"Scenarios: {len(scenarios)}, Workers: {p.experiment_workers}")
+    print("---------------------------------------")
+    if p.experiment_workers == 1:
+        results = _run_assumptions(p, scenarios)
+    else:
+        results = _run_pool(p, scenarios)
+    print_results(results)
+    return results
@@ -55,6 +55,20 @@ class Parameters:
     # Solver will try to maximize both single char striding and multi-char chords.
     #   Striding is given the weight of stride_wt and mcc the weight of (1 - stride_wt)
     stride_wt: float = 0.1
+    # Chain of preprocessing tactics applied once before the search, see TACTIC_CHAINS in
+    #   lib/tactics.py. "none" searches the problem as built. Benchmark chains with tactics.py.
+    tactic_chain: str = "none"
+    # What-if experiments (experiments.py). 1 searches every scenario on a single solver using
+    #   assumptions, more fans the scenarios out to that many worker processes, 0 uses every core.
+    experiment_workers: int = 1
+    # Cube-and-conquer (cube.py) splits the problem on the chords of the cube_letters most
+    #   frequent letters. Each of those letters is tried on every legal chord that uses at most
+    #   cube_buttons buttons, plus one "any other chord" case. Each letter multiplies the number of
+    #   cubes by roughly the number of chords, so keep cube_letters small.
+    cube_letters: int = 2
+    cube_buttons: int = 1
+    # Number of worker processes solving cubes, 0 uses every core.
+    cube_workers: int = 0
 
 
     def setup():
@@ -0,0 +1,81 @@
+from z3 import *
+from dataclasses import dataclass
+from .load import NGrams
+from .buttons import Buttons
+import lib
+
+@dataclass
+class Problem:
+    s: Solver
+    n: NGrams
+    b: Buttons
+    total_count: ArithRef
+    chars_per_second: ArithRef
+
+    # Build the full set of constraints, everything except the CPS guess.
+    #   twiddler.py and the worker processes of cube.py both start from here so that
+    #   every search sees exactly the same problem.
+    def build(p):
+        s = Solver()
+        set_option(max_args=10000000, max_lines=1000000, max_depth=10000000, max_visited=1000000)
+        n = lib.NGrams.load_n_grams(p)
+        b = lib.problem_def(s, n)
+        # lib.ghost_combos(s, n, b)
+        lib.mcc_from_scc(s, n, b)
+        lib.cost_mcc(s, n, b)
+        lib.cost_scc(p, s, n, b)
+
+        # These letters frequently end words, so we don't want them
+        #   using the index finger, so they stride with SPACE.
+        s.add(Extract(11, 11, b.F[n.index['E']]) == 0) #Ends 20.1% of words
+        s.add(Extract(11, 11, b.F[n.index['S']]) == 0) #Ends 12.9% of words
+        s.add(Extract(11, 11, b.F[n.index['D']]) == 0) #Ends 9.98% of words
+        # s.add(Extract(11, 11, b.F[n.index['N']]) == 0) #Ends 9.31% of words
+        # s.add(Extract(11, 11, b.F[n.index['T']]) == 0) #Ends 8.97% of words
+        # s.add(Extract(11, 11, b.F[n.index['Y']]) == 0) #Ends 6.00% of words
+        # s.add(Extract(11, 11, b.F[n.index['R']]) == 0) #Ends 5.90% of words
+        # s.add(Extract(11, 11, b.F[n.index['F']]) == 0) #Ends 4.71% of words
+        # s.add(Extract(11, 11, b.F[n.index['O']]) == 0) #Ends 4.18% of words
+        # s.add(Extract(11, 11, b.F[n.index['L']]) == 0) #Ends 3.47% of words
+        # s.add(Extract(11, 11, b.F[n.index['G']]) == 0) #Ends 2.94% of words
+        # s.add(Extract(11, 11, b.F[n.index['A']]) == 0) #Ends 2.82% of words
+        # s.add(Extract(11, 11, b.F[n.index['H']]) == 0) #Ends 2.71% of words
+
+        # If E cannot use *M** can it achieve 2.6846? If not fix E here.
+        # s.add(Extract(7, 7, b.G[n.index['E']]) == 0)
+
+
+        # If cost of chords is given in seconds then cumulative_cost[len(n.grams)-1] is
+        #   the seconds to enter all n-grams k times per n-gram where k is the frequency
+        #   count of each n-gram.
+        # We can use this to calculate average characters per second:
+        # 1 / (cumulative_cost[len(n.grams)-1] / total_count) this simplifies to:
+        # total_count / cumulative_cost[len(n.grams)-1]
+        mcc_total_chars = 0
+        for i in range(len(n.count)):
+            mcc_total_chars += n.count[i] * len(n.grams[i])
+        stride_total_chars = 0
+        for i in range(n.bi_gram_size):
+            stride_total_chars += b.bi_count[i] * 2
+        total_count = RealVal(mcc_total_chars * (1 - p.stride_wt) +
+                              stride_total_chars * p.stride_wt)
+        print(f"Bigram Stride Weight: {p.stride_wt}, MCC Weight: {(1 - p.stride_wt)}")
+        print(f"Total count: {total_count}")
+        chars_per_second = Real("cps")
+        s.add(chars_per_second == total_count /
+            (b.cumulative_cost[len(n.grams)-1] * (1 - p.stride_wt) +
+            b.cum_stride_cost[n.bi_gram_size-1] * p.stride_wt))
+
+        # Timeout is given in milliseconds
+        s.set("timeout", (p.timeout.days * 24 * 60 * 60 + p.timeout.seconds) * 1000)
+        return Problem(s, n, b, total_count, chars_per_second)
+
+    # For some reason the solver cannot handle this constraint:
+    #   s.add(chars_per_second >= cps)
+    #   So we calclate max cumulative cost and set the limit that way.
+    def probe(self, guess_cps):
+        guess_max_cumulative_cost = self.total_count / guess_cps
+        return self.b.cumulative_cost[len(self.n.grams)-1] <= guess_max_cumulative_cost
+
+    def model(self):
+        return self.s.model()
@@ -0,0 +1,66 @@
+from z3 import sat, unsat, unknown
+from dataclasses import dataclass
+from datetime import datetime
+
+@dataclass
+class SearchResult:
+    hi_sat: float = 0
+    lo_unsat: float = float("inf")
+    lo_unknown: float = float("inf")
+    m: object = None
+
+# ***************************************
+# Search for the highest CPS
+# ***************************************
+# problem is anything with a solver s, probe(guess_cps) that returns the constraint
+#   for a guess and model() that returns the model of the last SAT check.
+# floor() is a CPS that is already known to be reachable elsewhere (ex: by another
+#   cube), the search only tries to beat it and quits once it cannot.
+# on_probe(guess_cps, result, guess_time) is called after every check and
+#   on_sat(m) after every SAT check.
+# assumptions are passed to every check, ex: to search one scenario of lib/experiments.py.
+def search_cps(p, problem, floor=lambda: 0, on_probe=None, on_sat=None, assumptions=[]):
+    s = problem.s
+    r = SearchResult()
+    search_has_failed = False
+    scopes = s.num_scopes()
+    # See comments above in "Guide the Search" for understanding how this works.
+    while min(r.lo_unsat, r.lo_unknown, p.cps_hi) - max(r.hi_sat, p.cps_lo, floor()) > p.cps_res:
+        solveTime = datetime.now()
+        hi_sat = max(r.hi_sat, floor())
+
+        # We start from p.cps_lo initially and increment up by initial_step_up
+        #   until we encounter an UNSAT or UNKNOWN problem then we begin
+        #   binary search.
+        if not search_has_failed:
+            guess_cps = max(hi_sat, p.cps_lo - p.initial_step_up()) + p.initial_step_up()
+        else:
+            guess_cps = p.after_failure_step_up(min(r.lo_unsat, r.lo_unknown, p.cps_hi),
+                                                max(hi_sat, p.cps_lo))
+
+        s.push() # Create new state
+        s.add(problem.probe(guess_cps))
+
+        result = s.check(*assumptions)
+        if on_probe is not None:
+            on_probe(guess_cps, result, datetime.now() - solveTime)
+
+        if result == sat:
+            r.hi_sat = guess_cps
+            r.m = problem.model()
+            if on_sat is not None:
+                on_sat(r.m)
+        elif result == unsat:
+            r.lo_unsat = guess_cps
+            search_has_failed = True
+            s.pop() # Restore state (i.e. Remove guess constraint)
+                    # Only remove guess constraint when it can't be attained, not when sat.
+        elif result == unknown:
+            r.lo_unknown = guess_cps
+            search_has_failed = True
+            s.pop() # Restore state (i.e. Remove guess constraint)
+                    # Only remove guess constraint when it can't be attained, not when sat.
+
+    # Drop the guess constraints kept from SAT checks so the solver can be searched again.
+    s.pop(s.num_scopes() - scopes)
+    return r
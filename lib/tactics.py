@@ -0,0 +1,92 @@
+from z3 import *
+from dataclasses import dataclass
+from datetime import datetime
+from .problem import Problem
+
+# ***************************************
+# Tactic pipeline
+# ***************************************
+# By default every check() preprocesses the whole formula again. A pipeline applies
+#   a chain of tactics to the problem once and runs the CPS probes on a solver
+#   holding the reduced goal instead.
+# Chains are picked by name (Parameters.tactic_chain) so they can be benchmarked
+#   against each other with tactics.py.
+# Only the bit-vector part can be bit-blasted, the costs stay reals, so even
+#   "sat-core" leaves a SAT core plus linear real arithmetic.
+# Never add "elim-uncnstr" to a chain. It removes cost_bound, which is only
+#   constrained by the probes added after preprocessing.
+TACTIC_CHAINS = {
+    "none": [],
+    "simplify": ["simplify", "propagate-values"],
+    "solve-eqs": ["simplify", "propagate-values", "solve-eqs", "simplify"],
+    "bit-blast": ["simplify", "propagate-values", "solve-eqs", "simplify",
+                  "bit-blast", "simplify"],
+    "sat-core": ["simplify", "propagate-values", "solve-eqs", "simplify",
+                 "max-bv-sharing", "bit-blast", "propagate-values", "simplify"],
+}
+
+def goal_size(g):
+    return int(Probe("size")(g)), int(Probe("num-exprs")(g)), int(Probe("num-consts")(g))
+
+def print_goal_size(name, g, time):
+    size, num_exprs, num_consts = goal_size(g)
+    print(f"{name:16} - {size:9} - {num_exprs:11} - {num_consts:10} - {time}")
+
+# Apply tactics one at a time so the size after each one can be reported.
+#   cache maps every chain prefix already applied to its goal, so chains that
+#   start the same way only pay for the shared tactics once.
+def apply_chain(g, chain, cache):
+    print(f"Tactic           - Formulas  - Expressions - Constants  - Time")
+    print_goal_size("(input)", g, "")
+    for i in range(len(chain)):
+        prefix = tuple(chain[:i + 1])
+        if prefix in cache:
+            g = cache[prefix]
+            print_goal_size(chain[i], g, "cached")
+            continue
+        tacticTime = datetime.now()
+        r = Tactic(chain[i])(g)
+        # The probes need a single reduced goal, so chains must not split the problem.
+        assert len(r) == 1
+        g = r[0]
+        cache[prefix] = g
+        print_goal_size(chain[i], g, datetime.now() - tacticTime)
+    return g
+
+@dataclass
+class Pipeline:
+    s: Solver
+    problem: Problem
+    goal: Goal
+    cost_bound: ArithRef
+
+    # Variables of problem may be renamed or eliminated by the tactics, so constraints
+    #   on them cannot be added to the reduced solver. Add them to problem.s first.
+    def build(p, problem, name, cache=None):
+        if cache is None:
+            cache = {}
+        chain = TACTIC_CHAINS[name]
+        print(f"Tactic chain: {name} ({', '.join(chain)})")
+        # The probes only tighten cost_bound, which survives preprocessing because
+        #   it is never solved for.
+        cost_bound = Real("cost_bound")
+        g = Goal()
+        g.add(problem.s.assertions())
+        g.add(problem.b.cumulative_cost[len(problem.n.grams)-1] <= cost_bound)
+        g = apply_chain(g, chain, cache)
+
+        s = Solver()
+        # Without this the model leaves out variables the tactics introduced and
+        #   convert_model can not rebuild the original assignment.
+        s.set("model.compact", False)
+        s.set("timeout", (p.timeout.days * 24 * 60 * 60 + p.timeout.seconds) * 1000)
+        s.add(g)
+        return Pipeline(s, problem, g, cost_bound)
+
+    def probe(self, guess_cps):
+        guess_max_cumulative_cost = self.problem.total_count / guess_cps
+        return self.cost_bound <= guess_max_cumulative_cost
+
+    # Map the model of the reduced goal back to the variables of problem.
+    def model(self):
+        return self.goal.convert_model(self.s.model())
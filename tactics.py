@@ -0,0 +1,33 @@
+from datetime import datetime
+import lib
+import sys
+
+# Benchmark tactic chains against each other.
+#   python tactics.py [chain ...]
+# Runs the full CPS search once per chain (every chain in lib/tactics.py if none
+#   are given) on the same problem and reports where each one got to.
+setupTime = datetime.now()
+p = lib.Parameters.setup()
+problem = lib.Problem.build(p)
+names = sys.argv[1:] if len(sys.argv) > 1 else list(lib.TACTIC_CHAINS)
+print(f"N-Grams: {str(len(problem.n.grams))}, Setup Time: {datetime.now() - setupTime}")
+print("---------------------------------------")
+
+def on_probe(guess_cps, result, guess_time):
+    print(f"{guess_cps:.9f} - {str(result):7} - {guess_time}")
+
+cache = {}
+summary = []
+for name in names:
+    pipelineTime = datetime.now()
+    pipeline = lib.Pipeline.build(p, problem, name, cache)
+    print(f"Preprocess Time: {datetime.now() - pipelineTime}")
+    print(f"CharsPerSec - Result  - Time:This Run")
+    solverTime = datetime.now()
+    r = lib.search_cps(p, pipeline, on_probe=on_probe)
+    summary.append((name, r, datetime.now() - solverTime, datetime.now() - pipelineTime))
+    print("---------------------------------------")
+
+print(f"Chain            - Sat      - Unknown  - Unsat    - Time:Search   - Time:Total")
+for name, r, search_time, total_time in summary:
+    print(f"{name:16} - {r.hi_sat:.6f} - {r.lo_unknown:.6f} - {r.lo_unsat:.6f} - {search_time} - {total_time}")